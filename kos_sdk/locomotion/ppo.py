@@ -12,7 +12,7 @@ import logging
 import math
 import os
 import time
-from typing import cast
+from typing import Optional
 
 import colorlogging
 import numpy as np
@@ -20,6 +20,8 @@ import onnxruntime as ort
 import pykos
 from numpy.typing import NDArray
 
+from kos_sdk.utils.event_loop import run
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +52,7 @@ ACTUATOR_ID_TO_NAME = {
 # Policy input constants
 COMMAND_VELOCITY = np.array([-0.5, 0.0, 0.0], dtype=np.float32)
 PROJECTED_GRAVITY = np.array([0.0, 0.0, -1.0], dtype=np.float32)
+OBS_SIZE = 60
 
 # Map actuator IDs to policy indices (just enumerate them in order)
 ACTUATOR_ID_TO_POLICY_IDX = {
@@ -74,6 +77,14 @@ ACTUATOR_ID_TO_POLICY_IDX = {
 }
 
 
+# Actuator names padded to the longest name, for aligned debug output
+_MAX_NAME_LENGTH = max(len(name) for name in ACTUATOR_ID_TO_NAME.values())
+_PADDED_ACTUATOR_NAMES = [
+    (actuator_id, f"{ACTUATOR_ID_TO_NAME[actuator_id]:<{_MAX_NAME_LENGTH}}")
+    for actuator_id in ACTUATOR_IDS
+]
+
+
 def load_policy(checkpoint_dir: str) -> ort.InferenceSession:
     """Load ONNX policy from checkpoint directory."""
     policy_files = [f for f in os.listdir(checkpoint_dir) if f.endswith(".onnx")]
@@ -86,27 +97,30 @@ def load_policy(checkpoint_dir: str) -> ort.InferenceSession:
 
 
 def create_policy_input(
-    positions: dict[int, float], prev_actions: np.ndarray
+    positions: dict[int, float],
+    prev_actions: np.ndarray,
+    out: Optional[NDArray[np.float32]] = None,
 ) -> NDArray[np.float32]:
-    """Create observation vector for policy from current state."""
-    joint_angles = np.zeros(18, dtype=np.float32)
+    """Create observation vector for policy from current state.
+
+    The observation is laid out as command velocity, projected gravity, joint angles,
+    joint velocities and previous actions. Pass `out` to fill a preallocated buffer of
+    OBS_SIZE floats in place instead of allocating a new one.
+    """
+    if out is None:
+        out = np.empty(OBS_SIZE, dtype=np.float32)
 
+    out[0:3] = COMMAND_VELOCITY
+    out[3:6] = PROJECTED_GRAVITY
+
+    joint_angles = out[6:24]
     for actuator_id, policy_idx in ACTUATOR_ID_TO_POLICY_IDX.items():
         joint_angles[policy_idx] = positions.get(actuator_id, 0.0)
 
-    joint_velocities = np.zeros(18, dtype=np.float32)
-
-    obs = np.concatenate(
-        [
-            COMMAND_VELOCITY,
-            PROJECTED_GRAVITY,
-            joint_angles,
-            joint_velocities,
-            prev_actions,
-        ],
-    ).astype(np.float32)
+    out[24:42] = 0.0  # Joint velocities
+    out[42:60] = prev_actions
 
-    return cast(NDArray[np.float32], obs.astype(np.float32))
+    return out
 
 
 def print_state_and_actions(
@@ -115,19 +129,19 @@ def print_state_and_actions(
     actions: np.ndarray,
 ) -> None:
     """Print current joint positions and policy actions."""
-    logger.debug("=== Current State and Actions ===")
+    # Called every timestep, so skip all formatting unless debug output is on
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
 
-    # Find the longest name for alignment
-    max_name_length = max(len(name) for name in ACTUATOR_ID_TO_NAME.values())
+    logger.debug("=== Current State and Actions ===")
 
-    for actuator_id in ACTUATOR_IDS:
+    for actuator_id, padded_name in _PADDED_ACTUATOR_NAMES:
         pos_deg = math.degrees(positions.get(actuator_id, 0.0))
-        policy_idx = ACTUATOR_ID_TO_POLICY_IDX[actuator_id]
-        action = actions[policy_idx]
+        action = actions[ACTUATOR_ID_TO_POLICY_IDX[actuator_id]]
         logger.debug(
             "timestep %4d: %s: pos=%6.2f deg, action=%6.3f rad",
             count,
-            f"{ACTUATOR_ID_TO_NAME[actuator_id]:<{max_name_length}}",
+            padded_name,
             pos_deg,
             action,
         )
@@ -151,24 +165,25 @@ async def reinforcement_learning_test(kos: pykos.KOS) -> None:
     session = load_policy(policy_dir)
     input_name = session.get_inputs()[0].name
 
-    # Initialize previous actions
+    # Initialize previous actions and the reused observation buffer
     prev_actions = np.zeros(18, dtype=np.float32)
+    obs_buffer = np.empty(OBS_SIZE, dtype=np.float32)
 
     # Performance tracking variables
     count = 0
-    start_time = time.time()
+    start_time = now = time.monotonic()
     end_time = start_time + 10  # Run for 10 seconds like test_00
 
-    last_second = int(time.time())
+    next_second = start_time + 1.0
     second_count = 0
 
-    while time.time() < end_time:
+    while now < end_time:
         # Get robot state and run inference
         response = await kos.actuator.get_actuators_state(ACTUATOR_IDS)
         positions = {state.actuator_id: math.radians(state.position) for state in response.states}
 
         # Create policy input and run inference
-        obs = create_policy_input(positions, prev_actions)
+        obs = create_policy_input(positions, prev_actions, obs_buffer)
         actions = session.run(None, {input_name: obs.reshape(1, -1)})[0][0]
 
         # Store actions for next iteration
@@ -184,22 +199,22 @@ async def reinforcement_learning_test(kos: pykos.KOS) -> None:
         count += 1
         second_count += 1
 
-        # Log performance each second
-        current_second = int(time.time())
-        if current_second != last_second:
+        # Log performance each second; this clock read also drives the loop condition
+        now = time.monotonic()
+        if now >= next_second:
             logger.info(
                 "Time: %.2f seconds - Inference calls this second: %d",
-                current_second - start_time,
+                now - start_time,
                 second_count,
             )
             second_count = 0
-            last_second = current_second
+            next_second += 1.0
 
         # Small sleep to prevent overwhelming the system
         await asyncio.sleep(0.001)
 
     # Print final statistics
-    elapsed_time = time.time() - start_time
+    elapsed_time = time.monotonic() - start_time
     logger.info("Total inference calls: %d", count)
     logger.info("Elapsed time: %.2f seconds", elapsed_time)
     logger.info("Average inference calls per second: %.2f", count / elapsed_time)
@@ -207,4 +222,4 @@ async def reinforcement_learning_test(kos: pykos.KOS) -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
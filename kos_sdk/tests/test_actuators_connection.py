@@ -2,27 +2,27 @@ from typing import Dict
 
 from loguru import logger
 
-from kos_sdk.utils.robot import ID_TO_JOINT, JOINT_TO_ID, RobotInterface
+from kos_sdk.utils.robot import ACTUATOR_ID_SET, ID_TO_JOINT, RobotInterface
 
 
 async def test_actuator_connection(robot_ip: str = "") -> Dict:
     """Test connection to all actuators and report which ones are responding."""
     async with RobotInterface(ip=robot_ip) as robot:
-        all_actuator_ids = set(JOINT_TO_ID.values())
+        all_actuator_ids = ACTUATOR_ID_SET
 
         logger.info("Checking actuator responses...")
         try:
-            feedback_state = await robot.kos.actuator.get_actuators_state(list(all_actuator_ids))
+            feedback_state = await robot.kos.actuator.get_actuators_state(sorted(all_actuator_ids))
             responding_ids = {state.actuator_id for state in feedback_state.states}
             missing_ids = all_actuator_ids - responding_ids
+            missing_joints = sorted(ID_TO_JOINT.get(id) or f"Unknown-{id}" for id in missing_ids)
 
             if not missing_ids:
                 logger.success(f"All {len(all_actuator_ids)} actuators are responding!")
             else:
                 logger.warning(f"Found {len(responding_ids)} of {len(all_actuator_ids)} actuators.")
                 logger.error(f"Missing actuators: {sorted(missing_ids)}")
-                missing_joints = [ID_TO_JOINT.get(id, f"Unknown-{id}") for id in missing_ids]
-                logger.error(f"Missing joints: {sorted(missing_joints)}")
+                logger.error(f"Missing joints: {missing_joints}")
 
             return {
                 "success": len(missing_ids) == 0,
@@ -30,11 +30,7 @@ async def test_actuator_connection(robot_ip: str = "") -> Dict:
                 "responding_actuators": len(responding_ids),
                 "responding_ids": sorted(list(responding_ids)),
                 "missing_ids": sorted(list(missing_ids)),
-                "missing_joints": (
-                    sorted([ID_TO_JOINT.get(id, f"Unknown-{id}") for id in missing_ids])
-                    if missing_ids
-                    else []
-                ),
+                "missing_joints": missing_joints,
             }
 
         except Exception as e:
@@ -1,15 +1,15 @@
-import asyncio
 from typing import Callable, List
 
 from loguru import logger
 
 from kos_sdk.tests import actuators_connection, connection, imu, led, servos
-from kos_sdk.utils.robot import RobotInterface
+from kos_sdk.utils.event_loop import run
+from kos_sdk.utils.robot import RobotInterface, kos_pool
 
 robot = RobotInterface(ip="10.33.10.65")
 
 
-async def main() -> None:
+async def run_tests() -> None:
     test_functions: List[tuple[str, Callable, list]] = [
         ("Connection Test", connection.test_connection, [robot.ip]),
         ("Actuator Connection Test", actuators_connection.test_actuator_connection, [robot.ip]),
@@ -37,5 +37,11 @@ async def main() -> None:
     logger.success("All tests completed successfully!")
 
 
+async def main() -> None:
+    # The tests share one connection to the robot instead of opening one each
+    async with kos_pool():
+        await run_tests()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,84 +1,236 @@
+import asyncio
 import time
+from collections import deque
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, AsyncGenerator, Deque, Dict, List
 
-import matplotlib.pyplot as plt
 import numpy as np
 from loguru import logger
 
 from kos_sdk.utils.robot import RobotInterface
 
+# Used to size the initial sample buffer; it doubles if the IMU is faster.
+EXPECTED_SAMPLE_RATE = 200
+IMU_FIELDS = 9
+
+# Bounds for the number of concurrent get_imu_values requests, which hides RPC latency.
+INITIAL_REQUESTS_IN_FLIGHT = 4
+MAX_REQUESTS_IN_FLIGHT = 16
+
+NS_PER_SECOND = 1_000_000_000
+
 
 @dataclass
 class ImuTestResults:
-    """Results from running the IMU test."""
+    """Results from running the IMU test.
+
+    `samples` has one row per reading with the columns accel x/y/z, gyro x/y/z and
+    mag x/y/z; the per-sensor and per-axis properties are views into it.
+    """
 
     avg_rate: float
     total_samples: int
     duration: float
     timestamps: List[float]
     samples_per_second: List[int]
-    accel_x: List[float]
-    accel_y: List[float]
-    accel_z: List[float]
-    gyro_x: List[float]
-    gyro_y: List[float]
-    gyro_z: List[float]
-    mag_x: List[float]
-    mag_y: List[float]
-    mag_z: List[float]
-
-
-async def collect_data(robot_ip: str = "", duration_seconds: int = 5) -> Dict[str, Any]:
-    """Collect IMU data for the specified duration."""
+    samples: np.ndarray
+
+    @property
+    def accel(self) -> np.ndarray:
+        return self.samples[:, 0:3]
+
+    @property
+    def gyro(self) -> np.ndarray:
+        return self.samples[:, 3:6]
+
+    @property
+    def mag(self) -> np.ndarray:
+        return self.samples[:, 6:9]
+
+    @property
+    def accel_x(self) -> np.ndarray:
+        return self.samples[:, 0]
+
+    @property
+    def accel_y(self) -> np.ndarray:
+        return self.samples[:, 1]
+
+    @property
+    def accel_z(self) -> np.ndarray:
+        return self.samples[:, 2]
+
+    @property
+    def gyro_x(self) -> np.ndarray:
+        return self.samples[:, 3]
+
+    @property
+    def gyro_y(self) -> np.ndarray:
+        return self.samples[:, 4]
+
+    @property
+    def gyro_z(self) -> np.ndarray:
+        return self.samples[:, 5]
+
+    @property
+    def mag_x(self) -> np.ndarray:
+        return self.samples[:, 6]
+
+    @property
+    def mag_y(self) -> np.ndarray:
+        return self.samples[:, 7]
+
+    @property
+    def mag_z(self) -> np.ndarray:
+        return self.samples[:, 8]
+
+
+class _RunningStats:
+    """Welford's online mean and population standard deviation over fixed-width rows."""
+
+    def __init__(self, width: int) -> None:
+        self.count = 0
+        self.mean = np.zeros(width)
+        self._m2 = np.zeros(width)
+
+    def update(self, row: np.ndarray) -> None:
+        self.count += 1
+        delta = row - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (row - self.mean)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self._m2 / max(self.count, 1))
+
+
+def _axis_stats(means: np.ndarray, stds: np.ndarray, first_column: int) -> Dict[str, float]:
+    """Pick the x/y/z mean and std of one sensor out of the per-column statistics."""
+    x, y, z = first_column, first_column + 1, first_column + 2
+    return {
+        "x_mean": float(means[x]),
+        "y_mean": float(means[y]),
+        "z_mean": float(means[z]),
+        "x_std": float(stds[x]),
+        "y_std": float(stds[y]),
+        "z_std": float(stds[z]),
+    }
+
+
+async def stream_imu_values(robot: RobotInterface) -> AsyncGenerator[Any, None]:
+    """Yield IMU readings in request order while keeping several requests in flight.
+
+    The number of concurrent requests is re-tuned every second: it grows while the
+    sample rate improves by at least 10% and shrinks when it drops by as much.
+    """
+    in_flight: Deque[asyncio.Task] = deque()
+    window = INITIAL_REQUESTS_IN_FLIGHT
+    rate = last_rate = 0
+    next_tune = time.monotonic() + 1.0
+    try:
+        while True:
+            while len(in_flight) < window:
+                in_flight.append(asyncio.create_task(robot.kos.imu.get_imu_values()))
+            yield await in_flight.popleft()
+
+            rate += 1
+            now = time.monotonic()
+            if now >= next_tune:
+                if rate >= last_rate * 1.1:
+                    window = min(window + 1, MAX_REQUESTS_IN_FLIGHT)
+                elif rate <= last_rate * 0.9:
+                    window = max(window - 1, 1)
+                rate, last_rate, next_tune = 0, rate, now + 1.0
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+async def collect_data(
+    robot_ip: str = "", duration_seconds: int = 5, keep_samples: bool = True
+) -> Dict[str, Any]:
+    """Collect IMU data for the specified duration.
+
+    Accel and gyro statistics are accumulated while collecting, so memory stays
+    bounded for long runs when the raw samples are not kept.
+
+    Args:
+        robot_ip: IP address of the robot.
+        duration_seconds: How long to collect for.
+        keep_samples: Keep every reading in `results.samples`. When False the
+            returned samples array is empty.
+
+    Returns:
+        The test summary, including the `ImuTestResults` under "results".
+    """
     try:
         async with RobotInterface(robot_ip) as robot:
             logger.info(f"Starting IMU test for {duration_seconds} seconds...")
 
             # Initialize data storage
             count = 0
-            start_time = time.time()
-            end_time = start_time + duration_seconds
+            start_ns = time.monotonic_ns()
+            end_ns = start_ns + duration_seconds * NS_PER_SECOND
+            next_second_ns = start_ns + NS_PER_SECOND
 
             timestamps = []
             samples_per_second = []
-            accel_x, accel_y, accel_z = [], [], []
-            gyro_x, gyro_y, gyro_z = [], [], []
-            mag_x, mag_y, mag_z = [], [], []
+            capacity = max(1, int(duration_seconds * EXPECTED_SAMPLE_RATE)) if keep_samples else 0
+            # float32 covers the sensors' effective precision at half the memory.
+            samples = np.empty((capacity, IMU_FIELDS), dtype=np.float32)
 
-            last_second = int(start_time)
+            stats = _RunningStats(IMU_FIELDS)
             second_count = 0
 
             # Collect data
-            while time.time() < end_time:
-                imu_values = await robot.kos.imu.get_imu_values()
-                count += 1
-                second_count += 1
-
-                accel_x.append(imu_values.accel_x)
-                accel_y.append(imu_values.accel_y)
-                accel_z.append(imu_values.accel_z)
-                gyro_x.append(imu_values.gyro_x)
-                gyro_y.append(imu_values.gyro_y)
-                gyro_z.append(imu_values.gyro_z)
-                mag_x_val = imu_values.mag_x if imu_values.mag_x is not None else 0.0
-                mag_y_val = imu_values.mag_y if imu_values.mag_y is not None else 0.0
-                mag_z_val = imu_values.mag_z if imu_values.mag_z is not None else 0.0
-                mag_x.append(mag_x_val)
-                mag_y.append(mag_y_val)
-                mag_z.append(mag_z_val)
-
-                current_second = int(time.time())
-                if current_second != last_second:
-                    timestamps.append(current_second - start_time)
-                    samples_per_second.append(second_count)
-                    time_str = f"Time: {current_second - start_time:.2f}s"
-                    logger.info(f"{time_str} - Samples: {second_count}")
-                    second_count = 0
-                    last_second = current_second
+            async with aclosing(stream_imu_values(robot)) as imu_stream:
+                async for imu_values in imu_stream:
+                    # Read each optional mag field once instead of twice.
+                    mag_x_val = imu_values.mag_x
+                    mag_y_val = imu_values.mag_y
+                    mag_z_val = imu_values.mag_z
+                    row = np.array(
+                        (
+                            imu_values.accel_x,
+                            imu_values.accel_y,
+                            imu_values.accel_z,
+                            imu_values.gyro_x,
+                            imu_values.gyro_y,
+                            imu_values.gyro_z,
+                            0.0 if mag_x_val is None else mag_x_val,
+                            0.0 if mag_y_val is None else mag_y_val,
+                            0.0 if mag_z_val is None else mag_z_val,
+                        )
+                    )
+                    stats.update(row)
+                    if keep_samples:
+                        if count == len(samples):
+                            samples = np.concatenate((samples, np.empty_like(samples)))
+                        samples[count] = row
+                    count += 1
+                    second_count += 1
+
+                    # One clock read per sample drives both the per-second buckets and
+                    # the exit check.
+                    now_ns = time.monotonic_ns()
+                    if now_ns >= next_second_ns:
+                        elapsed = (now_ns - start_ns) / NS_PER_SECOND
+                        timestamps.append(elapsed)
+                        samples_per_second.append(second_count)
+                        second_count = 0
+                        next_second_ns += NS_PER_SECOND
+
+                    if now_ns >= end_ns:
+                        break
+
+            # The per-second counts are logged only now so the loop never blocks on
+            # log formatting or stderr writes.
+            for elapsed, per_second in zip(timestamps, samples_per_second):
+                logger.info(f"Time: {elapsed:.2f}s - Samples: {per_second}")
 
             # Calculate results
-            elapsed_time = time.time() - start_time
+            elapsed_time = (time.monotonic_ns() - start_ns) / NS_PER_SECOND
             avg_rate = count / elapsed_time
 
             stats_str = f"Test Complete: {count} samples, {elapsed_time:.2f}s"
@@ -91,35 +243,12 @@ async def collect_data(robot_ip: str = "", duration_seconds: int = 5) -> Dict[st
                 duration=elapsed_time,
                 timestamps=timestamps,
                 samples_per_second=samples_per_second,
-                accel_x=accel_x,
-                accel_y=accel_y,
-                accel_z=accel_z,
-                gyro_x=gyro_x,
-                gyro_y=gyro_y,
-                gyro_z=gyro_z,
-                mag_x=mag_x,
-                mag_y=mag_y,
-                mag_z=mag_z,
+                samples=samples[:count],
             )
 
-            # Calculate statistics
-            accel_stats = {
-                "x_mean": np.mean(accel_x),
-                "y_mean": np.mean(accel_y),
-                "z_mean": np.mean(accel_z),
-                "x_std": np.std(accel_x),
-                "y_std": np.std(accel_y),
-                "z_std": np.std(accel_z),
-            }
-
-            gyro_stats = {
-                "x_mean": np.mean(gyro_x),
-                "y_mean": np.mean(gyro_y),
-                "z_mean": np.mean(gyro_z),
-                "x_std": np.std(gyro_x),
-                "y_std": np.std(gyro_y),
-                "z_std": np.std(gyro_z),
-            }
+            means, stds = stats.mean, stats.std
+            accel_stats = _axis_stats(means, stds, 0)
+            gyro_stats = _axis_stats(means, stds, 3)
 
             return {
                 "success": True,
@@ -139,6 +268,8 @@ async def collect_data(robot_ip: str = "", duration_seconds: int = 5) -> Dict[st
 
 async def plot_imu_data(robot_ip: str = "", duration_seconds: int = 5) -> Dict[str, Any]:
     """Collect IMU data and generate plots."""
+    import matplotlib.pyplot as plt
+
     try:
         # Collect data
         result = await collect_data(robot_ip, duration_seconds)
@@ -1,30 +1,42 @@
 import asyncio
 from typing import Any, Dict
 
-import pykos
 from loguru import logger
 from PIL import Image
 
+from kos_sdk.utils.robot import get_kos, release_kos
+
 GRID_SIZE = (32, 16)
 
 
 async def test_led(robot_ip: str = "", blink_times: int = 3, delay: float = 0.5) -> Dict[str, Any]:
     logger.info("Starting LED test...")
 
+    kos = None
     try:
-        kos = pykos.KOS(ip=robot_ip)
-        image_on = Image.new("1", GRID_SIZE, "white")
-        image_off = Image.new("1", GRID_SIZE, "black")
+        kos = await get_kos(robot_ip)
+        image_on = Image.new("1", GRID_SIZE, "white").tobytes()
+        image_off = Image.new("1", GRID_SIZE, "black").tobytes()
 
-        await kos.led_matrix.write_buffer(image_off.tobytes())
+        await kos.led_matrix.write_buffer(image_off)
         print("LED will start blinking...")
+        # Toggle on fixed deadlines so the write latency doesn't stretch each phase.
+        loop = asyncio.get_running_loop()
+        next_toggle = loop.time()
         for i in range(blink_times):
-            await kos.led_matrix.write_buffer(image_on.tobytes())
-            await asyncio.sleep(delay)
-            await kos.led_matrix.write_buffer(image_off.tobytes())
-            await asyncio.sleep(delay)
+            for frame in (image_on, image_off):
+                await kos.led_matrix.write_buffer(frame)
+                if next_toggle < loop.time():
+                    # A slow write overran the schedule; restart it so every phase
+                    # still lasts a full delay instead of toggling back to back.
+                    next_toggle = loop.time()
+                next_toggle += delay
+                await asyncio.sleep(max(0.0, next_toggle - loop.time()))
         return {"success": True, "message": f"Completed {blink_times} blinks"}
 
     except Exception as e:
         logger.error(f"LED test failed: {e}")
         return {"success": False, "message": str(e)}
+    finally:
+        if kos is not None:
+            await release_kos(kos)
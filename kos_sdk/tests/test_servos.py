@@ -1,12 +1,29 @@
 import asyncio
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 from loguru import logger
 
-from kos_sdk.utils.robot import ID_TO_JOINT, RobotInterface
+from kos_sdk.utils.robot import ACTUATOR_ID_SET, ID_TO_JOINT, RobotInterface
+from kos_sdk.utils.unit_types import Degree
 
 DEFAULT_MOVEMENT_DEGREES = 10.0
 DEFAULT_WAIT_TIME = 0.5
+SETTLE_POLL_INTERVAL = 0.05
+SETTLE_TOLERANCE_DEGREES = 0.5
+SETTLE_VELOCITY = 1.0
+
+_ALL_IDS = tuple(ID_TO_JOINT.keys())
+
+
+def validate_actuator_ids(actuator_ids: Iterable[int]) -> Optional[Dict[str, Any]]:
+    """Return the error result for any unknown actuator IDs, or None if all are valid."""
+    invalid_ids = set(actuator_ids) - ACTUATOR_ID_SET
+    if not invalid_ids:
+        return None
+    logger.error(f"Invalid actuator IDs: {sorted(invalid_ids)}")
+    return {"success": [], "failed": [], "error": f"Invalid actuator IDs: {sorted(invalid_ids)}"}
 
 
 async def test_actuator_movement(
@@ -14,6 +31,10 @@ async def test_actuator_movement(
     actuator_id: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Test actuators and report which ones moved successfully."""
+    if actuator_id is not None:
+        error = validate_actuator_ids([actuator_id])
+        if error is not None:
+            return error
 
     async with RobotInterface(ip=robot_ip) as robot:
         results: Dict[str, List[Dict[str, Any]]] = {"success": [], "failed": []}
@@ -21,11 +42,18 @@ async def test_actuator_movement(
         try:
             await robot.configure_actuators()
 
-            actuator_ids = [actuator_id] if actuator_id is not None else list(ID_TO_JOINT.keys())
+            actuator_ids = (actuator_id,) if actuator_id is not None else _ALL_IDS
+            id_to_joint = ID_TO_JOINT
+
+            # One read up front replaces a per-actuator read before each test.
+            state = await robot.kos.actuator.get_actuators_state(list(actuator_ids))
+            start_positions = {s.actuator_id: s.position for s in state.states}
 
             for act_id in actuator_ids:
-                name = ID_TO_JOINT.get(act_id, f"Actuator {act_id}")
-                success, reason = await test_single_actuator(robot, act_id, name)
+                name = id_to_joint.get(act_id) or f"Actuator {act_id}"
+                success, reason = await test_single_actuator(
+                    robot, act_id, name, start_positions.get(act_id)
+                )
 
                 result_data = {"id": act_id, "name": name}
                 if not success and reason:
@@ -48,53 +76,143 @@ async def test_single_actuator(
     robot: RobotInterface,
     actuator_id: int,
     name: str,
+    current_position: Optional[Degree] = None,
 ) -> Tuple[bool, Optional[str]]:
-    """Test a single actuator and return (success, reason)."""
+    """Test a single actuator and return (success, reason).
+
+    Pass `current_position` when it is already known to skip the initial state read.
+    """
     try:
-        state = await robot.kos.actuator.get_actuators_state([actuator_id])
-        if not state.states:
-            return False, "Could not get state"
+        if current_position is None:
+            state = await robot.kos.actuator.get_actuators_state([actuator_id])
+            if not state.states:
+                return False, "Could not get state"
+            current_position = state.states[0].position
 
-        current_position = state.states[0].position
-        target_position = current_position + DEFAULT_MOVEMENT_DEGREES
+        target_position = Degree(current_position + DEFAULT_MOVEMENT_DEGREES)
 
         await robot.set_real_command_positions({name: target_position})
-        await asyncio.sleep(DEFAULT_WAIT_TIME)
-
-        state = await robot.kos.actuator.get_actuators_state([actuator_id])
-        new_position = state.states[0].position
-        moved = abs(new_position - current_position) > 1.0
+        positions = await wait_for_settle(robot, {actuator_id: target_position})
+        if actuator_id not in positions:
+            raise RuntimeError("Could not get state")
+        moved = abs(positions[actuator_id] - current_position) > 1.0
 
         await robot.set_real_command_positions({name: current_position})
-        await asyncio.sleep(DEFAULT_WAIT_TIME)
+        await wait_for_settle(robot, {actuator_id: current_position})
         await robot.kos.actuator.configure_actuator(
             actuator_id=actuator_id,
             torque_enabled=False,
         )
 
-        logger.info(f"{name} {'moved successfully' if moved else 'did not move'}")
+        logger.info("{} {}", name, "moved successfully" if moved else "did not move")
         return moved, None if moved else "Did not move"
 
     except Exception as exc:
-        logger.error(f"Error testing {name}: {exc}")
+        logger.error("Error testing {}: {}", name, exc)
         try:
             await robot.kos.actuator.configure_actuator(
                 actuator_id=actuator_id,
                 torque_enabled=False,
             )
         except Exception as inner_exc:
-            logger.error(f"Error configuring actuator {actuator_id}: {inner_exc}")
+            logger.error("Error configuring actuator {}: {}", actuator_id, inner_exc)
         return False, str(exc)
 
 
+async def wait_for_settle(
+    robot: RobotInterface,
+    targets: Dict[int, float],
+) -> Dict[int, float]:
+    """Poll until every actuator is at its target and stopped, or DEFAULT_WAIT_TIME passes.
+
+    Returns the last position read for each actuator that reported a state.
+    """
+    actuator_ids = list(targets)
+    positions: Dict[int, float] = {}
+    deadline = time.monotonic() + DEFAULT_WAIT_TIME
+    while time.monotonic() < deadline:
+        await asyncio.sleep(SETTLE_POLL_INTERVAL)
+        state = await robot.kos.actuator.get_actuators_state(actuator_ids)
+        positions = {s.actuator_id: s.position for s in state.states}
+        if len(positions) == len(targets) and all(
+            abs(s.position - targets[s.actuator_id]) < SETTLE_TOLERANCE_DEGREES
+            and abs(s.velocity) < SETTLE_VELOCITY
+            for s in state.states
+        ):
+            break
+    return positions
+
+
+async def test_actuators_movement_batched(
+    robot_ip: str = "",
+    actuator_ids: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """Move all actuators at once so they share a single settling window per phase."""
+    actuator_ids = list(ID_TO_JOINT.keys()) if actuator_ids is None else actuator_ids
+    if not actuator_ids:
+        # An empty list would make get_actuators_state return every actuator.
+        return {"success": [], "failed": []}
+    error = validate_actuator_ids(actuator_ids)
+    if error is not None:
+        return error
+
+    async with RobotInterface(ip=robot_ip) as robot:
+        results: Dict[str, List[Dict[str, Any]]] = {"success": [], "failed": []}
+
+        try:
+            await robot.configure_actuators()
+
+            state = await robot.kos.actuator.get_actuators_state(actuator_ids)
+            read_ids = [s.actuator_id for s in state.states]
+            read_names = [ID_TO_JOINT[act_id] for act_id in read_ids]
+            start = np.fromiter((s.position for s in state.states), np.float64, len(read_ids))
+
+            targets = start + DEFAULT_MOVEMENT_DEGREES
+            await robot.set_real_command_positions(dict(zip(read_names, targets.tolist())))
+            new_positions = await wait_for_settle(robot, dict(zip(read_ids, targets.tolist())))
+            new = np.array([new_positions.get(act_id, np.nan) for act_id in read_ids])
+            moved = dict(zip(read_ids, (np.abs(new - start) > 1.0).tolist()))
+
+            await robot.set_real_command_positions(dict(zip(read_names, start.tolist())))
+            await wait_for_settle(robot, dict(zip(read_ids, start.tolist())))
+
+            for act_id in actuator_ids:
+                result_data = {"id": act_id, "name": ID_TO_JOINT[act_id]}
+                if act_id not in moved or act_id not in new_positions:
+                    result_data["reason"] = "Could not get state"
+                elif not moved[act_id]:
+                    result_data["reason"] = "Did not move"
+                results["failed" if "reason" in result_data else "success"].append(result_data)
+
+        except Exception as e:
+            logger.error(f"Actuator test failed: {e}")
+            return {"success": [], "failed": [], "error": str(e)}
+
+        finally:
+            await asyncio.gather(
+                *(
+                    robot.kos.actuator.configure_actuator(actuator_id=act_id, torque_enabled=False)
+                    for act_id in actuator_ids
+                ),
+                return_exceptions=True,
+            )
+
+        log_test_results(results)
+        return results
+
+
 def log_test_results(results: Dict[str, List]) -> None:
-    logger.info("\n=== Actuator Test Results ===")
-    logger.info(f"Successfully moved ({len(results['success'])}):")
-    for actuator in results["success"]:
-        logger.info(f"  - {actuator['name']} (ID: {actuator['id']})")
-
-    logger.info(f"\nFailed to move ({len(results['failed'])}):")
-    for actuator in results["failed"]:
-        logger.info(
-            f"  - {actuator['name']} (ID: {actuator['id']}): {actuator.get('reason', 'Unknown')}"
-        )
+    lines = [
+        "",
+        "=== Actuator Test Results ===",
+        f"Successfully moved ({len(results['success'])}):",
+    ]
+    lines.extend(
+        f"  - {actuator['name']} (ID: {actuator['id']})" for actuator in results["success"]
+    )
+    lines.append(f"\nFailed to move ({len(results['failed'])}):")
+    lines.extend(
+        f"  - {actuator['name']} (ID: {actuator['id']}): {actuator.get('reason', 'Unknown')}"
+        for actuator in results["failed"]
+    )
+    logger.info("\n".join(lines))
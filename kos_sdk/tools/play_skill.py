@@ -1,41 +1,145 @@
-import json
+import contextlib
 import os
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from loguru import logger
 
+from kos_sdk.tools.skills_data import load_json
 from kos_sdk.utils.unit_types import Degree
 
+# Highest-resolution monotonic clock, used for playback timing
+_now = time.perf_counter
 
-@dataclass
-class Frame:
-    joint_positions: Dict[str, Union[int, Degree]]
-    delay: float
+# Bumped whenever the layout of the skill array cache changes
+SKILL_CACHE_VERSION = 1
 
 
 @dataclass
 class SkillData:
     name: str
-    frames: List[Frame]
+    joint_names: List[str]
+    positions: np.ndarray  # One row per frame, one column per joint name
+    delays: np.ndarray  # Seconds each frame is held before the next one
+
+
+def stack_joint_positions(
+    frames: Sequence[Dict[str, Union[int, Degree]]], joint_names: List[str]
+) -> np.ndarray:
+    """Stack per-frame joint positions into an (n_frames, n_joints) array ordered by `joint_names`.
+
+    A joint missing from a frame holds its value from the closest earlier frame, or
+    from the first later frame if no earlier frame has it.
+    """
+    positions = np.array(
+        [[frame.get(name, np.nan) for name in joint_names] for frame in frames],
+        dtype=np.float64,
+    ).reshape(len(frames), len(joint_names))
+    for row in range(1, len(positions)):
+        missing = np.isnan(positions[row])
+        positions[row, missing] = positions[row - 1, missing]
+    for row in range(len(positions) - 2, -1, -1):
+        missing = np.isnan(positions[row])
+        positions[row, missing] = positions[row + 1, missing]
+    return positions
+
+
+def load_skill_cache(
+    cache_path: str, source_path: str
+) -> Optional[Tuple[str, List[str], np.ndarray, np.ndarray]]:
+    """Read the array cache of a skill if it was built from the current JSON file.
+
+    The cache is only used when its format version and the recorded mtime and size of
+    the JSON match exactly, so a JSON restored with an older mtime is still reparsed.
+
+    Returns:
+        The skill name, joint names, stacked positions and frame delays, or None if
+        there is no usable cache.
+    """
+    try:
+        source = os.stat(source_path)
+        with np.load(cache_path) as cache:
+            if (
+                int(cache["version"]) != SKILL_CACHE_VERSION
+                or int(cache["source_mtime_ns"]) != source.st_mtime_ns
+                or int(cache["source_size"]) != source.st_size
+            ):
+                return None
+            joint_names = cache["joint_names"].tolist()
+            positions = cache["positions"]
+            delays = cache["delays"]
+            if positions.shape != (len(delays), len(joint_names)):
+                return None
+            return str(cache["name"]), joint_names, positions, delays
+    except Exception:
+        return None
+
+
+def save_skill_cache(
+    cache_path: str,
+    source_stat: os.stat_result,
+    name: str,
+    joint_names: List[str],
+    positions: np.ndarray,
+    delays: np.ndarray,
+) -> None:
+    """Write the array cache of a skill; failures are logged and otherwise ignored.
+
+    Args:
+        cache_path: Where to write the cache
+        source_stat: Stat of the JSON file taken before it was read, which the cache
+            is tied to
+        name: Name of the skill
+        joint_names: Joint name of each column of `positions`
+        positions: Stacked positions, one row per frame
+        delays: Delay of each frame in seconds
+    """
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(SKILL_CACHE_VERSION),
+                source_mtime_ns=np.array(source_stat.st_mtime_ns),
+                source_size=np.array(source_stat.st_size),
+                name=np.array(name),
+                joint_names=np.array(joint_names, dtype=str),
+                positions=positions,
+                delays=delays,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write skill cache {cache_path}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
 
 
 class PlaySkill:
-    def __init__(self, skill_name: str, frequency: float) -> None:
+    def __init__(self, skill_name: str, frequency: float, cache_dir: Optional[str] = None) -> None:
         """Initialize the skill player.
 
         Args:
             skill_name: Name of the skill to play
             frequency: Interpolation frequency in Hz
+            cache_dir: Directory for the parsed-skill array cache. Defaults to the
+                skill's own directory, which for the bundled skills is inside the
+                installed package; those `.json.npz` files are not removed by
+                `pip uninstall`.
         """
+        self.cache_dir = cache_dir
         self.frequency = frequency
         self.frame_delay = 1.0 / frequency
         self.skill_data: Optional[SkillData] = None
         self.current_frame_index = 0
         self.interpolation_time = 0.0
-        self.last_update_time = time.time()
+        self.playback_start_time = _now()
         self.current_positions: Dict[str, Union[int, Degree]] = {}
+        self.deltas_arr = np.empty((0, 0))  # positions[i + 1] - positions[i] of the skill
+        self._interpolated: np.ndarray = np.empty(0)  # Scratch row reused by every update
+        self.frame_end_times = np.empty(0)  # Playback time at which each frame ends
         self.load_skill_file(skill_name)
 
     def load_skill_file(self, skill_name: str) -> None:
@@ -49,56 +153,74 @@ class PlaySkill:
             skill_name += ".json"
         filepath = os.path.join(base_path, skill_name)
 
+        # Parsed skills are cached as arrays, which load much faster than the JSON
+        cache_dir = self.cache_dir if self.cache_dir is not None else os.path.dirname(filepath)
+        cache_path = os.path.join(cache_dir, os.path.basename(filepath) + ".npz")
+
         try:
-            with open(filepath, "r") as f:
-                data = json.load(f)
-                frames = [
-                    Frame(
-                        joint_positions=frame["joint_positions"],
-                        delay=frame["delay"],
-                    )
-                    for frame in data["frames"]
-                ]
-                self.skill_data = SkillData(name=data["name"], frames=frames)
-            logger.info(f"Loaded skill {skill_name} with {len(self.skill_data.frames)} frames")
-            if self.skill_data.frames:
-                self.current_positions = self.skill_data.frames[0].joint_positions.copy()
+            cached = load_skill_cache(cache_path, filepath)
+            if cached is not None:
+                skill = SkillData(*cached)
+            else:
+                source_stat = os.stat(filepath)
+                data = load_json(filepath)
+                frame_positions = [frame["joint_positions"] for frame in data["frames"]]
+                joint_names = list(dict.fromkeys(j for frame in frame_positions for j in frame))
+                skill = SkillData(
+                    name=data["name"],
+                    joint_names=joint_names,
+                    positions=stack_joint_positions(frame_positions, joint_names),
+                    delays=np.array([frame["delay"] for frame in data["frames"]], dtype=np.float64),
+                )
+                save_skill_cache(
+                    cache_path,
+                    source_stat,
+                    skill.name,
+                    skill.joint_names,
+                    skill.positions,
+                    skill.delays,
+                )
+            self.skill_data = skill
+            self.deltas_arr = np.diff(skill.positions, axis=0)
+            self.frame_end_times = np.cumsum(skill.delays)
+            self._interpolated = np.empty(len(skill.joint_names))
+            logger.info(f"Loaded skill {skill_name} with {len(skill.delays)} frames")
+            # Allocated once per skill; updates only overwrite values in place
+            self.current_positions = dict.fromkeys(skill.joint_names, Degree(0.0))
+            if len(skill.delays):
+                self.current_positions.update(zip(skill.joint_names, skill.positions[0].tolist()))
         except Exception as e:
             logger.error(f"Failed to load skill {skill_name}: {e}")
             self.skill_data = None
 
     def update(self, feedback_positions: Dict[str, Union[int, Degree]]) -> None:
         """Update interpolation between keyframes."""
-        if not self.skill_data or self.current_frame_index >= len(self.skill_data.frames):
+        skill = self.skill_data
+        if not skill or self.current_frame_index >= len(skill.delays):
             return
 
-        current_time = time.time()
-        dt = current_time - self.last_update_time
-        self.last_update_time = current_time
-
-        current_frame = self.skill_data.frames[self.current_frame_index]
-        self.interpolation_time += dt
-
-        # If we've reached the delay time, move to next frame
-        if self.interpolation_time >= current_frame.delay:
-            self.current_frame_index += 1
-            self.interpolation_time = 0.0
-            if self.current_frame_index < len(self.skill_data.frames):
-                self.current_positions = self.skill_data.frames[
-                    self.current_frame_index
-                ].joint_positions.copy()
+        # Find the frame from the total playback time rather than by accumulating
+        # per-update deltas, so timing errors never build up across frames
+        elapsed = _now() - self.playback_start_time
+        previous_index = self.current_frame_index
+        index = int(np.searchsorted(self.frame_end_times, elapsed, side="right"))
+        self.current_frame_index = index
+        if index >= len(skill.delays):
             return
 
-        # Interpolate between current and next frame
-        if self.current_frame_index + 1 < len(self.skill_data.frames):
-            next_frame = self.skill_data.frames[self.current_frame_index + 1]
-            t = self.interpolation_time / current_frame.delay
+        frame_start = self.frame_end_times[index - 1] if index else 0.0
+        self.interpolation_time = elapsed - frame_start
 
-            for joint in current_frame.joint_positions:
-                current_pos = current_frame.joint_positions[joint]
-                next_pos = next_frame.joint_positions[joint]
-                interpolated_value = current_pos + (next_pos - current_pos) * t
-                self.current_positions[joint] = Degree(interpolated_value)
+        # Interpolate between current and next frame, all joints at once
+        if index + 1 < len(skill.delays):
+            t = self.interpolation_time / skill.delays[index]
+            interpolated = self._interpolated
+            np.multiply(self.deltas_arr[index], t, out=interpolated)
+            np.add(interpolated, skill.positions[index], out=interpolated)
+            self.current_positions.update(zip(skill.joint_names, interpolated.tolist()))
+        elif index != previous_index:
+            # Hold the last frame for its delay
+            self.current_positions.update(zip(skill.joint_names, skill.positions[index].tolist()))
 
     def get_command_positions(self) -> Dict[str, Union[int, Degree]]:
         """Get the interpolated joint positions.
@@ -107,6 +229,6 @@ class PlaySkill:
             Dictionary of joint positions, or empty dict if no skill loaded
             or playback complete
         """
-        if not self.skill_data or self.current_frame_index >= len(self.skill_data.frames):
+        if not self.skill_data or self.current_frame_index >= len(self.skill_data.delays):
             return {}
         return self.current_positions
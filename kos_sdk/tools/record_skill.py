@@ -17,7 +17,7 @@ from kos_sdk.utils.unit_types import Degree
 IS_MACOS = platform.system() == "Darwin"
 
 
-@dataclass
+@dataclass(slots=True)
 class Frame:
     joint_positions: Dict[str, Union[int, Degree]]
     delay: float  # Delay in seconds before next frame
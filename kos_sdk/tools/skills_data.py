@@ -2,9 +2,31 @@
 
 import json
 from dataclasses import dataclass, field
+from typing import Any
 
+try:
+    import orjson
 
-@dataclass
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def load_json(filename: str) -> Any:
+    """Parse a JSON file, using orjson when it is installed.
+
+    Args:
+        filename: Path to the JSON file
+
+    Returns:
+        The decoded JSON document
+    """
+    with open(filename, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+@dataclass(slots=True)
 class Frame:
     """Single frame of joint positions.
 
@@ -24,9 +46,9 @@ class Frame:
             Dictionary mapping actuator IDs to their positions
         """
         return {
-            joint_name_to_id[name]: position
+            actuator_id: position
             for name, position in self.joint_positions.items()
-            if name in joint_name_to_id
+            if (actuator_id := joint_name_to_id.get(name)) is not None
         }
 
 
@@ -83,8 +105,7 @@ def load_skill(filename: str) -> SkillData:
     Returns:
         The loaded skill data with proper typing
     """
-    with open(filename, "r") as f:
-        data = json.load(f)
+    data = load_json(filename)
 
     frames = [Frame(joint_positions=frame) for frame in data["frames"]]
 
@@ -0,0 +1,27 @@
+"""Event loop setup for the SDK's command-line entry points."""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a default asyncio event loop.
+
+    On Python 3.12+ the loop also uses the eager task factory, so a task starts running
+    inside `create_task` and one that finishes without suspending never gets scheduled.
+    This stays on the stock loop: pykos calls `nest_asyncio.apply()` on connect, which
+    cannot patch alternative loops such as uvloop.
+    """
+    loop = asyncio.new_event_loop()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+    return loop
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Drop-in replacement for `asyncio.run` that uses `new_event_loop`."""
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        return runner.run(main)
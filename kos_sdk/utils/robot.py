@@ -1,10 +1,15 @@
 """Interface for the robot."""
 
+import asyncio
 import subprocess
-from typing import Any, Dict, Union
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
 from pykos import KOS
+from pykos.services.actuator import ActuatorCommand
 
 from kos_sdk.utils.unit_types import Degree
 
@@ -35,22 +40,94 @@ JOINT_TO_ID = {
 
 ID_TO_JOINT = {v: k for k, v in JOINT_TO_ID.items()}
 
+# Frozen for O(1) membership checks when validating user-supplied IDs.
+ACTUATOR_ID_SET = frozenset(ID_TO_JOINT)
+
+# Request list for whole-robot reads; pykos copies it into the request message.
+_ALL_ACTUATOR_IDS = list(JOINT_TO_ID.values())
+
 DEFAULT_KP = 32
 DEFAULT_KD = 32
 
+# Zero pose for every actuator, sent as one batch by `homing_actuators`.
+_HOME_COMMANDS: List[ActuatorCommand] = [
+    {"actuator_id": actuator_id, "position": 0.0, "velocity": 0.0, "torque": 0.0}
+    for actuator_id in JOINT_TO_ID.values()
+]
+
+# Clients shared inside the current `kos_pool` block. A context variable scopes the pool
+# to the task that opened the block (and tasks it spawns), so sibling blocks in
+# concurrent tasks each get their own pool and never close each other's clients.
+_KOS_POOL: ContextVar[Optional[Dict[str, KOS]]] = ContextVar("_KOS_POOL", default=None)
+
+
+@asynccontextmanager
+async def kos_pool() -> AsyncIterator[None]:
+    """Share one KOS client per ip between `get_kos` calls made inside the block.
+
+    The pooled clients are closed when the outermost block exits, while their event
+    loop is still running. Nested blocks reuse the outer pool.
+    """
+    if _KOS_POOL.get() is not None:
+        yield
+        return
+    pool: Dict[str, KOS] = {}
+    token = _KOS_POOL.set(pool)
+    try:
+        yield
+    finally:
+        _KOS_POOL.reset(token)
+        # Close every client even if closing one of them fails
+        results = await asyncio.gather(
+            *(kos.__aexit__(None, None, None) for kos in pool.values()),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+
+async def get_kos(ip: str) -> KOS:
+    """Return a connected KOS client for `ip`.
+
+    Inside a `kos_pool` block the client is shared and owned by the pool; otherwise it is
+    a new client. Either way, hand it back with `release_kos` when done.
+    """
+    pool = _KOS_POOL.get()
+    kos = pool.get(ip) if pool is not None else None
+    if kos is None:
+        kos = KOS(ip=ip)
+        await kos.__aenter__()
+        if pool is not None:
+            pool[ip] = kos
+    return kos
+
+
+async def release_kos(kos: KOS) -> None:
+    """Close a client from `get_kos`, unless it belongs to an active `kos_pool`."""
+    pool = _KOS_POOL.get()
+    if pool is None or pool.get(kos.ip) is not kos:
+        await kos.__aexit__(None, None, None)
+
 
 class RobotInterface:
     def __init__(self, ip: str) -> None:
         self.ip: str = ip
+        self._feedback_cache: Optional[Tuple[float, Any]] = None
+        # One reusable command dict per joint. pykos copies these into protobuf
+        # messages before its first await, so they are free to mutate per call.
+        self._command_scratch: Dict[str, ActuatorCommand] = {
+            name: {"actuator_id": actuator_id, "position": 0.0, "velocity": 0.0, "torque": 0.0}
+            for name, actuator_id in JOINT_TO_ID.items()
+        }
 
     async def __aenter__(self) -> "RobotInterface":
         self.check_connection()
-        self.kos = KOS(ip=self.ip)
-        await self.kos.__aenter__()
+        self.kos = await get_kos(self.ip)
         return self
 
     async def __aexit__(self, *args: Any) -> None:
-        await self.kos.__aexit__(*args)
+        await release_kos(self.kos)
 
     def check_connection(self) -> None:
         try:
@@ -67,42 +144,66 @@ class RobotInterface:
             raise ConnectionError("Robot connection failed.")
 
     async def configure_actuators(self) -> None:
-        for actuator_id in JOINT_TO_ID.values():
-            await self.kos.actuator.configure_actuator(
-                actuator_id=actuator_id,
-                kp=DEFAULT_KP,
-                kd=DEFAULT_KD,
-                torque_enabled=True,
+        await asyncio.gather(
+            *(
+                self.kos.actuator.configure_actuator(
+                    actuator_id=actuator_id,
+                    kp=DEFAULT_KP,
+                    kd=DEFAULT_KD,
+                    torque_enabled=True,
+                )
+                for actuator_id in JOINT_TO_ID.values()
             )
+        )
 
     async def configure_actuators_record(self) -> None:
         logger.info("Enabling soft torque for actuator...")
-        for actuator_id in JOINT_TO_ID.values():
-            await self.kos.actuator.configure_actuator(
-                actuator_id=actuator_id,
-                torque_enabled=False,
+        actuator_ids = list(JOINT_TO_ID.values())
+        await asyncio.gather(
+            *(
+                self.kos.actuator.configure_actuator(
+                    actuator_id=actuator_id,
+                    torque_enabled=False,
+                )
+                for actuator_id in actuator_ids
             )
-            logger.success(f"Successfully enabled torque for actuator {actuator_id}")
+        )
+        logger.success(f"Successfully enabled torque for actuators {actuator_ids}")
 
     async def homing_actuators(self) -> None:
-        for actuator_id in JOINT_TO_ID.values():
-            logger.info(f"Setting actuator {actuator_id} to 0 position")
-            await self.kos.actuator.command_actuators(
-                [{"actuator_id": actuator_id, "position": 0, "velocity": 0.0, "torque": 0.0}]
-            )
-            logger.success(f"Successfully set actuator {actuator_id} to 0 position")
+        logger.info(f"Setting actuators {_ALL_ACTUATOR_IDS} to 0 position")
+        await self.kos.actuator.command_actuators(_HOME_COMMANDS)
+        logger.success(f"Successfully set actuators {_ALL_ACTUATOR_IDS} to 0 position")
 
     async def set_real_command_positions(self, positions: Dict[str, Union[int, Degree]]) -> None:
-        await self.kos.actuator.command_actuators(
-            [
-                {"actuator_id": JOINT_TO_ID[name], "position": pos, "velocity": 0.0, "torque": 0.0}
-                for name, pos in positions.items()
-            ]
-        )
-
-    async def get_feedback_state(self) -> Any:
-        return await self.kos.actuator.get_actuators_state(list(JOINT_TO_ID.values()))
-
-    async def get_feedback_positions(self) -> Dict[str, Union[int, Degree]]:
-        feedback_state = await self.get_feedback_state()
+        if not positions:
+            return
+        scratch = self._command_scratch
+        commands: List[ActuatorCommand] = []
+        for name, pos in positions.items():
+            command = scratch[name]
+            command["position"] = pos
+            commands.append(command)
+        await self.kos.actuator.command_actuators(commands)
+
+    async def get_feedback_state(self, max_age: float = 0.0) -> Any:
+        """Read the state of every actuator.
+
+        Args:
+            max_age: Return the previous reading instead of querying the robot if it is
+                at most this many seconds old. The default of 0 always queries.
+
+        Returns:
+            The actuator state response.
+        """
+        now = time.monotonic()
+        cached = self._feedback_cache
+        if max_age > 0 and cached is not None and now - cached[0] <= max_age:
+            return cached[1]
+        state = await self.kos.actuator.get_actuators_state(_ALL_ACTUATOR_IDS)
+        self._feedback_cache = (now, state)
+        return state
+
+    async def get_feedback_positions(self, max_age: float = 0.0) -> Dict[str, Union[int, Degree]]:
+        feedback_state = await self.get_feedback_state(max_age)
         return {ID_TO_JOINT[state.actuator_id]: state.position for state in feedback_state.states}
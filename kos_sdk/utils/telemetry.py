@@ -5,17 +5,25 @@ import csv
 import datetime
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional, TextIO
+from typing import TYPE_CHECKING, Any, Deque, List, Optional, TextIO, Tuple
 
-import matplotlib.pyplot as plt
-import pandas as pd
 import pykos
-from matplotlib.gridspec import GridSpec
+
+if TYPE_CHECKING:
+    # Plotting libraries are slow to import, so they are only loaded when plotting.
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from matplotlib.gridspec import GridSpec
 
 logger = logging.getLogger(__name__)
 
+LOG_INTERVAL = 0.01  # 100Hz target rate
+LOG_BUFFER_SIZE = 64 * 1024  # Bytes buffered per CSV file between writes to disk
+MAX_ERROR_BACKOFF = 1.0  # Longest pause in seconds between retries after failed frames
+
 
 @dataclass
 class Actuator:
@@ -30,14 +38,27 @@ class Actuator:
 class TelemetryLogger:
     """Telemetry logging for KOS robots (real or simulated)."""
 
-    def __init__(self, kos: pykos.KOS, actuator_ids: List[int], log_dir: str = "telemetry_logs"):
+    def __init__(
+        self,
+        kos: pykos.KOS,
+        actuator_ids: List[int],
+        log_dir: str = "telemetry_logs",
+        loop_time_window: int = 100,
+    ):
         """Initialize telemetry logger.
 
         Args:
             kos: Connected KOS instance (real or sim)
             actuator_ids: List of actuator IDs to monitor
             log_dir: Directory to store telemetry logs
+            loop_time_window: Number of recent loop periods averaged for the
+                logged loop frequency
+
+        Raises:
+            ValueError: If `loop_time_window` is less than 1
         """
+        if loop_time_window < 1:
+            raise ValueError(f"loop_time_window must be at least 1, got {loop_time_window}")
         self.kos = kos
         self.log_dir = Path(log_dir)
         self.actuator_ids = actuator_ids  # Now required parameter
@@ -56,8 +77,9 @@ class TelemetryLogger:
         self._is_logging = False
 
         # Performance tracking
-        self.last_loop_time = time.time()
-        self.loop_times: List[float] = []
+        self.last_loop_time = time.monotonic()
+        self.loop_times: Deque[float] = deque(maxlen=loop_time_window)
+        self._loop_time_sum = 0.0
 
     async def start(self) -> None:
         """Start telemetry logging."""
@@ -68,9 +90,9 @@ class TelemetryLogger:
 
         # Open log files and initialize CSV writers
 
-        self.imu_file = open(self.log_dir / f"imu_{timestamp}.csv", "w", newline="")
-        self.actuator_file = open(self.log_dir / f"actuator_{timestamp}.csv", "w", newline="")
-        self.control_file = open(self.log_dir / f"control_{timestamp}.csv", "w", newline="")
+        self.imu_file = self._open_log(f"imu_{timestamp}.csv")
+        self.actuator_file = self._open_log(f"actuator_{timestamp}.csv")
+        self.control_file = self._open_log(f"control_{timestamp}.csv")
 
         # Initialize CSV writers with headers
         if self.imu_file:
@@ -128,6 +150,10 @@ class TelemetryLogger:
         # Start background logging task
         asyncio.create_task(self._log_loop())
 
+    def _open_log(self, filename: str) -> TextIO:
+        """Open a CSV log with a large buffer, so rows reach the disk in big batches."""
+        return open(self.log_dir / filename, "w", newline="", buffering=LOG_BUFFER_SIZE)
+
     async def stop(self) -> None:
         """Stop telemetry logging and close files."""
         self._is_logging = False
@@ -140,82 +166,111 @@ class TelemetryLogger:
 
     async def _log_loop(self) -> None:
         """Background task for continuous logging."""
+        # Sleep until fixed deadlines so the time spent logging a frame does not add
+        # to the period.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        failures = 0
         while self._is_logging:
             try:
                 await self._log_single_frame()
             except Exception as e:
-                logger.error(f"Error in telemetry logging: {e}")
-            await asyncio.sleep(0.01)  # 100Hz target rate
+                # Back off exponentially rather than retrying every period while broken.
+                failures += 1
+                logger.error("Error in telemetry logging (attempt %d): %s", failures, e)
+                await asyncio.sleep(min(MAX_ERROR_BACKOFF, LOG_INTERVAL * 2**failures))
+                deadline = loop.time()
+                continue
+            failures = 0
+            deadline += LOG_INTERVAL
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Fell behind; restart the schedule rather than bursting to catch up,
+                # but still yield once so other tasks on the loop are not starved.
+                deadline = loop.time()
+                await asyncio.sleep(0)
+
+    async def _read_imu(self) -> Tuple[Any, Any, Any]:
+        """Read euler angles, raw values and quaternion concurrently."""
+        return await asyncio.gather(
+            self.kos.imu.get_euler_angles(),
+            self.kos.imu.get_imu_values(),
+            self.kos.imu.get_quaternion(),
+        )
 
     async def _log_single_frame(self) -> None:
         """Log a single frame of telemetry data."""
         timestamp = datetime.datetime.now().isoformat()
 
+        # Fan out the IMU and actuator reads so they share one round trip
+        cmd_start = time.perf_counter()
+        imu, states = await asyncio.gather(
+            self._read_imu(),
+            self.kos.actuator.get_actuators_state(self.actuator_ids),
+            return_exceptions=True,
+        )
+        cmd_latency = time.perf_counter() - cmd_start
+
         # Log IMU data
-        try:
-            cmd_start = time.time()
-            imu_euler = await self.kos.imu.get_euler_angles()
-            imu_values = await self.kos.imu.get_imu_values()
-            quat = await self.kos.imu.get_quaternion()
-            cmd_latency = time.time() - cmd_start
-
-            if self.imu_writer is not None:
-                self.imu_writer.writerow(
-                    [
-                        timestamp,
-                        imu_euler.roll,
-                        imu_euler.pitch,
-                        imu_euler.yaw,
-                        imu_values.accel_x,
-                        imu_values.accel_y,
-                        imu_values.accel_z,
-                        imu_values.gyro_x,
-                        imu_values.gyro_y,
-                        imu_values.gyro_z,
-                        quat.w,
-                        quat.x,
-                        quat.y,
-                        quat.z,
-                    ]
-                )
-        except Exception as e:
-            logger.warning(f"Failed to get IMU data: {e}")
-
-        # Log actuator data
-        try:
-            cmd_start = time.time()
-            states = await self.kos.actuator.get_actuators_state(self.actuator_ids)
-            cmd_latency = time.time() - cmd_start
-
-            for actuator_id, state in zip(self.actuator_ids, states.states):
-                if self.actuator_writer is not None:
-                    self.actuator_writer.writerow(
-                        [
-                            timestamp,
-                            actuator_id,
-                            state.position,
-                            state.velocity,
-                            state.torque,
-                            state.current,
-                            state.temperature,
-                            state.voltage,
-                            state.online,
-                            ",".join(state.faults) if state.faults else "",
-                        ]
-                    )
-        except Exception as e:
-            logger.warning(f"Failed to get actuator data: {e}")
+        if isinstance(imu, BaseException):
+            logger.warning("Failed to get IMU data: %s", imu)
+        elif self.imu_writer is not None:
+            imu_euler, imu_values, quat = imu
+            self.imu_writer.writerow(
+                [
+                    timestamp,
+                    imu_euler.roll,
+                    imu_euler.pitch,
+                    imu_euler.yaw,
+                    imu_values.accel_x,
+                    imu_values.accel_y,
+                    imu_values.accel_z,
+                    imu_values.gyro_x,
+                    imu_values.gyro_y,
+                    imu_values.gyro_z,
+                    quat.w,
+                    quat.x,
+                    quat.y,
+                    quat.z,
+                ]
+            )
+
+        # Log actuator data. Without it the frame is a failure, which lets `_log_loop`
+        # back off while the connection is broken.
+        if isinstance(states, BaseException):
+            raise states
+        if self.actuator_writer is not None:
+            # Each state carries its own ID, so rows stay correct even if the
+            # response order or length differs from the requested IDs.
+            self.actuator_writer.writerows(
+                [
+                    timestamp,
+                    state.actuator_id,
+                    state.position,
+                    state.velocity,
+                    state.torque,
+                    state.current,
+                    state.temperature,
+                    state.voltage,
+                    state.online,
+                    ",".join(state.faults) if state.faults else "",
+                ]
+                for state in states.states
+            )
 
         # Calculate and log control metrics
-        current_time = time.time()
+        current_time = time.monotonic()
         loop_duration = current_time - self.last_loop_time
         self.last_loop_time = current_time
+        # Rolling window with a running sum, so the average costs O(1) per frame
+        if len(self.loop_times) == self.loop_times.maxlen:
+            self._loop_time_sum -= self.loop_times[0]
         self.loop_times.append(loop_duration)
+        self._loop_time_sum += loop_duration
 
-        if len(self.loop_times) > 100:  # Keep a rolling window
-            self.loop_times.pop(0)
-
-        avg_frequency = 1.0 / (sum(self.loop_times) / len(self.loop_times))
+        avg_frequency = len(self.loop_times) / self._loop_time_sum
 
         if self.control_writer is not None:
             self.control_writer.writerow(
@@ -230,6 +285,10 @@ class TelemetryLogger:
 
 def plot_latest_logs(log_dir: str = "telemetry_logs") -> None:
     """Plot the most recent telemetry logs."""
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from matplotlib.gridspec import GridSpec
+
     # Find latest log files
     imu_files = sorted(Path(log_dir).glob("imu_*.csv"))
     actuator_files = sorted(Path(log_dir).glob("actuator_*.csv"))
@@ -273,7 +332,7 @@ def plot_latest_logs(log_dir: str = "telemetry_logs") -> None:
     plt.show()
 
 
-def plot_imu_data(fig: plt.Figure, gs: GridSpec, imu_data: pd.DataFrame) -> None:
+def plot_imu_data(fig: "plt.Figure", gs: "GridSpec", imu_data: "pd.DataFrame") -> None:
     """Plot IMU data in the left column."""
     # Euler Angles
     ax_euler = fig.add_subplot(gs[0, 0])
@@ -309,7 +368,7 @@ def plot_imu_data(fig: plt.Figure, gs: GridSpec, imu_data: pd.DataFrame) -> None
     ax_gyro.legend()
 
 
-def plot_control_metrics(fig: plt.Figure, gs: GridSpec, control_data: pd.DataFrame) -> None:
+def plot_control_metrics(fig: "plt.Figure", gs: "GridSpec", control_data: "pd.DataFrame") -> None:
     """Plot control metrics."""
     ax_control = fig.add_subplot(gs[4, 0])
     ax_control.plot(control_data["time"], control_data["loop_frequency"], label="Loop Frequency")
@@ -326,7 +385,7 @@ def plot_control_metrics(fig: plt.Figure, gs: GridSpec, control_data: pd.DataFra
     ax_control2.legend(loc="upper right")
 
 
-def plot_actuator_data(fig: plt.Figure, gs: GridSpec, actuator_data: pd.DataFrame) -> None:
+def plot_actuator_data(fig: "plt.Figure", gs: "GridSpec", actuator_data: "pd.DataFrame") -> None:
     """Plot actuator data in the right column."""
     axes = {
         "position": fig.add_subplot(gs[0, 1]),
@@ -346,10 +405,8 @@ def plot_actuator_data(fig: plt.Figure, gs: GridSpec, actuator_data: pd.DataFram
         "voltage": ("Actuator Voltages", "Voltage (V)"),
     }
 
-    for actuator_id in actuator_data["actuator_id"].unique():
-        mask = actuator_data["actuator_id"] == actuator_id
-        data = actuator_data[mask]
-
+    # A single groupby pass instead of a boolean mask over the whole frame per actuator
+    for actuator_id, data in actuator_data.groupby("actuator_id", sort=False):
         for param, ax in axes.items():
             ax.plot(data["time"], data[param], label=f"ID {actuator_id}")
 
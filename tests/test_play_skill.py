@@ -0,0 +1,115 @@
+"""Tests skill loading, caching and playback timing."""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from kos_sdk.tools import play_skill
+from kos_sdk.tools.play_skill import (
+    PlaySkill,
+    load_skill_cache,
+    save_skill_cache,
+    stack_joint_positions,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(play_skill, "_now", clock)
+    return clock
+
+
+def write_skill(path: Path) -> str:
+    frames = [
+        {"joint_positions": {"a": 0.0, "b": 10.0}, "delay": 1.0},
+        {"joint_positions": {"a": 10.0, "b": 30.0}, "delay": 0.5},
+        {"joint_positions": {"a": 20.0, "b": 50.0}, "delay": 2.0},
+    ]
+    path.write_text(json.dumps({"name": "wave", "frames": frames}))
+    return str(path)
+
+
+def test_stack_fills_missing_joints() -> None:
+    frames: List[dict] = [{"b": 1.0}, {"a": 2.0, "b": 3.0}, {"b": 4.0}]
+    positions = stack_joint_positions(frames, ["a", "b"])
+    np.testing.assert_array_equal(positions, [[2.0, 1.0], [2.0, 3.0], [2.0, 4.0]])
+
+
+def test_cached_load_matches_fresh_load(tmp_path: Path, clock: FakeClock) -> None:
+    skill_path = write_skill(tmp_path / "wave.json")
+    fresh = PlaySkill(skill_path, 50).skill_data
+    assert fresh is not None
+    assert os.path.exists(skill_path + ".npz")
+    assert not os.path.exists(skill_path + ".npz.tmp")
+
+    cached = PlaySkill(skill_path, 50).skill_data
+    assert cached is not None
+    assert cached.name == fresh.name == "wave"
+    assert cached.joint_names == fresh.joint_names == ["a", "b"]
+    np.testing.assert_array_equal(cached.positions, fresh.positions)
+    np.testing.assert_array_equal(cached.delays, fresh.delays)
+
+
+def test_cache_is_tied_to_source_mtime_and_size(tmp_path: Path) -> None:
+    source = write_skill(tmp_path / "wave.json")
+    cache = source + ".npz"
+    save_skill_cache(cache, os.stat(source), "wave", ["a"], np.zeros((1, 1)), np.ones(1))
+    assert load_skill_cache(cache, source) is not None
+
+    # A source restored with an older mtime, e.g. by `cp -p`, must not use the cache
+    os.utime(source, (0, 0))
+    assert load_skill_cache(cache, source) is None
+
+
+def test_cache_with_mismatched_shapes_is_ignored(tmp_path: Path) -> None:
+    source = write_skill(tmp_path / "wave.json")
+    cache = source + ".npz"
+    save_skill_cache(cache, os.stat(source), "wave", ["a", "b"], np.zeros((2, 1)), np.ones(2))
+    assert load_skill_cache(cache, source) is None
+
+
+def test_cache_dir(tmp_path: Path, clock: FakeClock) -> None:
+    skill_path = write_skill(tmp_path / "wave.json")
+    PlaySkill(skill_path, 50, cache_dir=str(tmp_path / "cache"))
+    assert (tmp_path / "cache" / "wave.json.npz").exists()
+    assert not os.path.exists(skill_path + ".npz")
+
+
+def test_playback_follows_cumulative_frame_times(tmp_path: Path, clock: FakeClock) -> None:
+    skill = PlaySkill(write_skill(tmp_path / "wave.json"), 50)
+    start = clock.now
+
+    expected = [
+        (0.5, 0, {"a": 5.0, "b": 20.0}),
+        (1.25, 1, {"a": 15.0, "b": 40.0}),
+        (2.0, 2, {"a": 20.0, "b": 50.0}),
+    ]
+    for elapsed, index, positions in expected:
+        clock.now = start + elapsed
+        skill.update({})
+        assert skill.current_frame_index == index
+        assert skill.get_command_positions() == pytest.approx(positions)
+
+    clock.now = start + 3.5
+    skill.update({})
+    assert skill.get_command_positions() == {}
+
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path: Path) -> None:
+    cache = tmp_path / "wave.json.npz"
+    cache.mkdir()  # os.replace cannot overwrite a directory with a file
+    save_skill_cache(str(cache), os.stat(tmp_path), "wave", ["a"], np.zeros((1, 1)), np.ones(1))
+    assert not (tmp_path / "wave.json.npz.tmp").exists()
@@ -0,0 +1,99 @@
+"""Tests the lifecycle of pooled KOS clients."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from kos_sdk.utils import robot
+from kos_sdk.utils.robot import get_kos, kos_pool, release_kos
+
+
+class FakeKOS:
+    def __init__(self, ip: str) -> None:
+        self.ip = ip
+        self.is_open = False
+
+    async def __aenter__(self) -> "FakeKOS":
+        self.is_open = True
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.is_open = False
+
+
+class FailingCloseKOS(FakeKOS):
+    async def __aexit__(self, *args: Any) -> None:
+        await super().__aexit__(*args)
+        raise ConnectionError("close failed")
+
+
+@pytest.fixture(autouse=True)
+def fake_kos(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(robot, "KOS", FakeKOS)
+
+
+def test_release_closes_unpooled_client() -> None:
+    async def main() -> Any:
+        kos = await get_kos("a")
+        assert kos.is_open
+        await release_kos(kos)
+        return kos
+
+    assert not asyncio.run(main()).is_open
+
+
+def test_pool_shares_clients_until_exit() -> None:
+    async def main() -> None:
+        async with kos_pool():
+            first = await get_kos("a")
+            await release_kos(first)
+            assert first.is_open
+            assert await get_kos("a") is first
+            assert await get_kos("b") is not first
+        assert not first.is_open
+
+    asyncio.run(main())
+
+
+def test_nested_pool_reuses_outer_pool() -> None:
+    async def main() -> None:
+        async with kos_pool():
+            outer = await get_kos("a")
+            async with kos_pool():
+                assert await get_kos("a") is outer
+            assert outer.is_open
+        assert not outer.is_open
+
+    asyncio.run(main())
+
+
+def test_sibling_pools_do_not_close_each_other() -> None:
+    async def session(hold: float) -> Any:
+        async with kos_pool():
+            kos = await get_kos("a")
+            await asyncio.sleep(hold)
+            assert kos.is_open
+            return kos
+
+    async def main() -> None:
+        short, long = await asyncio.gather(session(0.0), session(0.01))
+        assert short is not long
+        assert not short.is_open and not long.is_open
+
+    asyncio.run(main())
+
+
+def test_pool_closes_every_client_when_one_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    clients = []
+
+    async def main() -> None:
+        async with kos_pool():
+            monkeypatch.setattr(robot, "KOS", FailingCloseKOS)
+            clients.append(await get_kos("a"))
+            monkeypatch.setattr(robot, "KOS", FakeKOS)
+            clients.append(await get_kos("b"))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
+    assert not any(kos.is_open for kos in clients)
@@ -0,0 +1,50 @@
+"""Tests the telemetry logging loop."""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from kos_sdk.utils.telemetry import TelemetryLogger
+
+
+class FailingKOS:
+    def __init__(self) -> None:
+        self.actuator_calls = 0
+        self.imu = SimpleNamespace(
+            get_euler_angles=self._fail,
+            get_imu_values=self._fail,
+            get_quaternion=self._fail,
+        )
+        self.actuator = SimpleNamespace(get_actuators_state=self._fail_actuators)
+
+    async def _fail(self) -> Any:
+        raise ConnectionError("robot unreachable")
+
+    async def _fail_actuators(self, actuator_ids: List[int]) -> Any:
+        self.actuator_calls += 1
+        raise ConnectionError("robot unreachable")
+
+
+def test_log_loop_backs_off_while_reads_fail(tmp_path: Path) -> None:
+    kos = FailingKOS()
+    telemetry = TelemetryLogger(kos, [11, 12], log_dir=str(tmp_path))  # type: ignore[arg-type]
+
+    async def main() -> None:
+        telemetry._is_logging = True
+        task = asyncio.create_task(telemetry._log_loop())
+        await asyncio.sleep(0.5)
+        telemetry._is_logging = False
+        await task
+
+    asyncio.run(main())
+    # At the 100Hz target this would be ~50 attempts; backing off from 20ms
+    # doubles the pause each time, leaving only a handful
+    assert 2 <= kos.actuator_calls <= 8
+
+
+def test_loop_time_window_must_be_positive(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        TelemetryLogger(FailingKOS(), [11], str(tmp_path), loop_time_window=0)  # type: ignore[arg-type]